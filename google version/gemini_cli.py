@@ -1,93 +1,211 @@
 import os
-import configparser
-from colorama import Fore, Back, init
+import re
+import functools
 import subprocess
 import sys
-import pkg_resources
 import time
 import random
-import google.generativeai as genai
-
-# Initialize colorama
-init(autoreset=True)
 
 CONFIG_FILE = "config.ini"
 MODELS_FILE = "available_models.txt"
 HCK_DIR = "hck"
 HCK_COMMAND_FILE = os.path.join(HCK_DIR, "command.txt")
 RGB_FILE = "rgb.ini"
-REQUIRED_LIBRARIES = ["google.generativeai", "colorama"]
+# Consoles before Windows 10 cannot render ANSI escapes and still need colorama
+LEGACY_WINDOWS = sys.platform == "win32" and sys.getwindowsversion().major < 10
+REQUIRED_LIBRARIES = ["google.generativeai"] + (["colorama"] if LEGACY_WINDOWS else [])
+# Import names that differ from the distribution name published on PyPI
+DISTRIBUTION_NAMES = {"google.generativeai": "google-generativeai"}
 INSTALLED_MARKER = ".installed"
-
-def get_rgb_color_code(rgb_string):
-    """Converts a comma-separated RGB string to a color code."""
-    try:
-        r, g, b = map(int, rgb_string.split(','))
-        return f"\033[38;2;{r};{g};{b}m"
-    except ValueError:
-        return None
-
-
-def get_rgb_bg_color_code(rgb_string):
-    """Converts a comma-separated RGB string to a background color code."""
-    try:
-        r, g, b = map(int, rgb_string.split(','))
-        return f"\033[48;2;{r};{g};{b}m"
-    except ValueError:
+MODELS_MAX_AGE = 24 * 60 * 60  # Seconds before the saved model list is refreshed at startup
+MAX_HISTORY_TURNS = 20  # Default number of user/model exchanges sent to the model
+DOWNLOAD_PERCENT_STEP = 5  # Percent advanced per progress bar frame
+DEFAULT_GEMINI_SETTINGS = {
+    "model": "gemini-pro",
+    "api_key": "",  # API key needs to be entered
+    "temperature": "0.9",
+    "top_k": "40",
+    "top_p": "0.9",
+    "hack": "true",  # New hack option
+    "max_history_turns": str(MAX_HISTORY_TURNS),  # 0 keeps the full history
+}
+BLUE = "\033[34m"
+RESET = "\033[0m"
+DEFAULT_RGB_COLORS = {
+    "blue_fg": "0,0,255",  # Default Blue foreground
+    "green_fg": "0,255,0",  # Default Green foreground
+    "yellow_fg": "255,255,0",  # Default Yellow foreground
+    "cyan_fg": "0,255,255",  # Default Cyan foreground
+    "magenta_fg": "255,0,255",  # Default Magenta foreground
+    "blue_bg": "0,0,0",  # Default blue background
+}
+_BOOLEAN_STATES = {"1": True, "yes": True, "true": True, "on": True,
+                   "0": False, "no": False, "false": False, "off": False}
+_RGB_RE = re.compile(r"^\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*$")
+
+# ANSI support is only enabled once color output is needed.
+_colors_initialized = False
+
+# google.generativeai is slow to import, so it is loaded on first API use.
+_genai = None
+
+
+def get_genai():
+    """Imports google.generativeai on first use and caches the module."""
+    global _genai
+    if _genai is None:
+        import google.generativeai as _genai
+    return _genai
+
+
+def init_colors():
+    """Enables ANSI colors the first time colored output is printed."""
+    global _colors_initialized
+    if not _colors_initialized:
+        if LEGACY_WINDOWS:
+            try:
+                import colorama
+                colorama.init()
+            except ImportError:
+                pass
+        elif sys.platform == "win32":
+            os.system("")  # Turns on VT escape processing in the Windows 10+ console
+        _colors_initialized = True
+
+
+@functools.lru_cache(maxsize=64)
+def _rgb_code(code_prefix, rgb_string):
+    """Converts a comma-separated RGB string to a color code.
+
+    code_prefix is 38 for a foreground or 48 for a background color.
+    Returns None if the string is not three comma-separated integers.
+    Results are cached, so rebuilding the ANSI table after a settings
+    change only parses values that actually changed.
+    """
+    match = _RGB_RE.match(rgb_string)
+    if match is None:
         return None
+    r, g, b = match.groups()
+    return f"\033[{code_prefix};2;{int(r)};{int(g)};{int(b)}m"
+
+
+def _load_ini(path):
+    """Reads a flat INI file into a {section: {key: value}} dict.
+
+    Only what config.ini and rgb.ini use is supported: [section] headers,
+    key = value lines and full-line '#' or ';' comments. Keys are lowercased
+    like configparser does.
+    """
+    data = {}
+    section = None
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in "#;":
+                continue
+            if line[0] == "[" and line[-1] == "]":
+                section = data.setdefault(line[1:-1].strip(), {})
+            elif section is not None and "=" in line:
+                key, value = line.split("=", 1)
+                section[key.strip().lower()] = value.strip()
+    return data
+
+
+def _write_ini(path, data):
+    """Writes a {section: {key: value}} dict in the format _load_ini reads."""
+    lines = []
+    for section, values in data.items():
+        lines.append(f"[{section}]")
+        lines.extend(f"{key} = {value}" for key, value in values.items())
+        lines.append("")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def parse_bool(value):
+    """Parses an INI boolean the way configparser.getboolean does."""
+    state = _BOOLEAN_STATES.get(value.strip().lower())
+    if state is None:
+        raise ValueError(f"Not a boolean: {value}")
+    return state
 
 
 def create_default_rgb_config():
     """Creates default RGB config file."""
-    rgb_config = configparser.ConfigParser()
-    rgb_config["colors"] = {
-        "blue_fg": "0,0,255",  # Default Blue foreground
-        "green_fg": "0,255,0",  # Default Green foreground
-        "yellow_fg": "255,255,0",  # Default Yellow foreground
-        "cyan_fg": "0,255,255",  # Default Cyan foreground
-        "magenta_fg": "255,0,255",  # Default Magenta foreground
-        "blue_bg": "0,0,0",  # Default blue background
-    }
-    with open(RGB_FILE, "w") as f:
-        rgb_config.write(f)
+    rgb_config = {"colors": dict(DEFAULT_RGB_COLORS)}
+    _write_ini(RGB_FILE, rgb_config)
     print(f"Default RGB configuration file created: {RGB_FILE}")
     return rgb_config
 
 
 def load_rgb_config():
     """Loads RGB configuration file, creates if not exists."""
-    rgb_config = configparser.ConfigParser()
-    if not os.path.exists(RGB_FILE):
+    try:
+        return _load_ini(RGB_FILE)
+    except FileNotFoundError:
         print(f"RGB configuration file not found: {RGB_FILE}, creating default...")
-        rgb_config = create_default_rgb_config()
-    else:
-        rgb_config.read(RGB_FILE)
-    return rgb_config
+        return create_default_rgb_config()
+
+
+def build_ansi_table(rgb_config):
+    """Builds the final escape string for every color in the RGB config.
+
+    Keys ending in "_bg" become background colors, all others foreground.
+    Colors missing from the config use DEFAULT_RGB_COLORS; invalid values
+    map to an empty string so they print uncolored.
+    """
+    colors = dict(DEFAULT_RGB_COLORS)
+    colors.update(rgb_config.get("colors", {}))
+    table = {}
+    for key, value in colors.items():
+        table[key] = _rgb_code(48 if key.endswith("_bg") else 38, value) or ""
+    return table
+
 
+class ColorTheme:
+    """Color codes parsed once from the RGB config, so printing does no parsing."""
 
-def blue_print(text, rgb_config=None):
+    __slots__ = ("blue_fg", "blue_bg", "cyan_fg", "magenta_fg", "green_fg", "yellow_fg", "reset")
+
+    def __init__(self, rgb_config):
+        self.reset = RESET
+        self.update(rgb_config)
+
+    def update(self, rgb_config):
+        """Rebuilds the color codes, e.g. after RGB settings were modified."""
+        table = build_ansi_table(rgb_config)
+        self.blue_fg = table["blue_fg"]
+        self.blue_bg = table["blue_bg"]
+        self.cyan_fg = table["cyan_fg"]
+        self.magenta_fg = table["magenta_fg"]
+        self.green_fg = table["green_fg"]
+        self.yellow_fg = table["yellow_fg"]
+
+
+def format_blue(text, theme=None):
+    """Wraps text in the theme's blue colors (or plain blue if no theme is given)."""
+    if theme:
+        return f"{theme.blue_bg}{theme.blue_fg}{text}{theme.reset}"  # Added background color and reset
+    return BLUE + text + RESET
+
+
+def blue_print(text, theme=None):
     """Prints text in a specified color (or blue if no color is specified)."""
-    if rgb_config:
-        blue_fg = rgb_config.get("colors", "blue_fg", fallback="0,0,255")
-        blue_bg = rgb_config.get("colors", "blue_bg", fallback="0,0,0")
-        color_code = get_rgb_color_code(blue_fg)
-        bg_color_code = get_rgb_bg_color_code(blue_bg)
-        print(f"{bg_color_code}{color_code}{text}\033[0m")  # Added background color and reset
-    else:
-        print(Fore.BLUE + text)
+    init_colors()
+    print(format_blue(text, theme))
 
 
 def check_and_install_libraries():
-    """Checks and installs required libraries if not present using pkg_resources."""
-    if os.path.exists(INSTALLED_MARKER):
-        blue_print("Libraries are already installed, skipping installation check.")
-        return
+    """Checks and installs required libraries if not present using importlib.metadata."""
+    # Deferred like google.generativeai: the fast path in main() never needs it
+    from importlib.metadata import distribution, PackageNotFoundError
     missing_libraries = []
     for lib in REQUIRED_LIBRARIES:
+        dist_name = DISTRIBUTION_NAMES.get(lib, lib)
         try:
-            pkg_resources.get_distribution(lib)
-        except pkg_resources.DistributionNotFound:
-            missing_libraries.append(lib)
+            distribution(dist_name)
+        except PackageNotFoundError:
+            missing_libraries.append(dist_name)
 
     if missing_libraries:
         blue_print("The following required libraries are missing:")
@@ -106,93 +224,145 @@ def check_and_install_libraries():
             sys.exit(1)  # Exit if installation fails
     else:
         blue_print("All required libraries are installed.")
+        # Mark the check as done so later runs take the fast path in main()
+        open(INSTALLED_MARKER, "w").close()
 
 def create_default_config():
     """Creates default configuration file."""
-    config = configparser.ConfigParser()
-    config["gemini"] = {
-        "model": "gemini-pro",
-        "api_key": "",  # API key needs to be entered
-        "temperature": "0.9",
-        "top_k": "40",
-        "top_p": "0.9",
-        "hack": "true",  # New hack option
-    }
-    with open(CONFIG_FILE, "w") as f:
-        config.write(f)
+    config = {"gemini": dict(DEFAULT_GEMINI_SETTINGS)}
+    _write_ini(CONFIG_FILE, config)
     blue_print(f"Default configuration file created: {CONFIG_FILE}")
 
 
 def load_config():
     """Loads configuration file, creates if not exists."""
-    config = configparser.ConfigParser()
-    if not os.path.exists(CONFIG_FILE):
+    try:
+        config = _load_ini(CONFIG_FILE)
+    except FileNotFoundError:
         blue_print(f"Configuration file not found: {CONFIG_FILE}, creating default...")
         create_default_config()
-    config.read(CONFIG_FILE)
+        config = _load_ini(CONFIG_FILE)
+    # Add settings introduced after the file was written, so they can be modified
+    gemini = config.setdefault("gemini", {})
+    for key, value in DEFAULT_GEMINI_SETTINGS.items():
+        gemini.setdefault(key, value)
     return config
 
 
 def save_config(config):
     """Saves configuration file."""
-    with open(CONFIG_FILE, "w") as f:
-        config.write(f)
+    _write_ini(CONFIG_FILE, config)
+
+
+class GeminiSettings:
+    """Model settings read from the [gemini] section once per session.
+
+    A manual __slots__ class rather than a dataclass, to keep creation and
+    attribute access cheap.
+    """
+
+    __slots__ = ("model_name", "temperature", "top_k", "top_p", "max_history_turns")
+
+    def __init__(self, config):
+        gemini = config.get("gemini", {})
+        self.model_name = gemini.get("model", "gemini-pro")
+        self.temperature = float(gemini.get("temperature", 0.9))
+        self.top_k = int(gemini.get("top_k", 40))
+        self.top_p = float(gemini.get("top_p", 0.9))
+        self.max_history_turns = int(gemini.get("max_history_turns", MAX_HISTORY_TURNS))
 
 
 def get_api_key(config):
     """Retrieves API key from config."""
-    api_key = config.get("gemini", "api_key").strip()
+    api_key = config.get("gemini", {}).get("api_key", "").strip()
     if not api_key:
         blue_print("Error: API key is empty! Please configure using 'setting' command.")
     return api_key
 
 
-def list_and_save_models(api_key, rgb_config):
+def list_and_save_models(api_key, theme):
     """Lists available models and saves to file."""
     if not api_key:
         return
+    genai = get_genai()
     genai.configure(api_key=api_key)
 
     try:
-        with open(MODELS_FILE, "w", encoding="utf-8") as f:
-            f.write("Available Models:\n")
-            f.write("------------------\n")
-            for m in genai.list_models():
-                if "generateContent" in m.supported_generation_methods:
-                    f.write(f"Model Name: {m.name}\n")
-                    if m.name == "gemini-1.5-flash":
-                        f.write("  Limitations: 1500 RPM (requests per minute)\n")
-                        f.write("  Pricing: Input and output are free\n")
-                    elif m.name == "gemini-1.5-pro":
-                        f.write("  Limitations: 2 RPM (requests per minute)\n")
-                        f.write("        32,000 TPM (tokens per minute)\n")
-                        f.write("        50 RPD (requests per day)\n")
-                    else:
-                        f.write("  Limitations: Please refer to official documentation\n")
-                    f.write("------------------\n")
-            blue_print(f"Model list saved to: {MODELS_FILE}", rgb_config)
+        lines = ["Available Models:", "------------------"]
+        for m in genai.list_models():
+            if "generateContent" in m.supported_generation_methods:
+                lines.append(f"Model Name: {m.name}")
+                if m.name == "gemini-1.5-flash":
+                    lines.append("  Limitations: 1500 RPM (requests per minute)")
+                    lines.append("  Pricing: Input and output are free")
+                elif m.name == "gemini-1.5-pro":
+                    lines.append("  Limitations: 2 RPM (requests per minute)")
+                    lines.append("        32,000 TPM (tokens per minute)")
+                    lines.append("        50 RPD (requests per day)")
+                else:
+                    lines.append("  Limitations: Please refer to official documentation")
+                lines.append("------------------")
+        # Only replace the file once listing succeeded, so a failed refresh
+        # keeps the old list and its mtime and the next start retries
+        tmp_file = MODELS_FILE + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_file, MODELS_FILE)
+        blue_print(f"Model list saved to: {MODELS_FILE}", theme)
     except Exception as e:
-        blue_print(f"Error listing models: {e}", rgb_config)
+        blue_print(f"Error listing models: {e}", theme)
+
+
+def models_file_is_fresh():
+    """Returns True if the saved model list is younger than MODELS_MAX_AGE."""
+    try:
+        return time.time() - os.path.getmtime(MODELS_FILE) < MODELS_MAX_AGE
+    except OSError:
+        return False
+
+
+def animations_enabled():
+    """Returns False if stdout is not a terminal or animations were turned off.
+
+    Animations can be turned off with the --no-anim flag or CHUN_NO_ANIM=1.
+    """
+    if not sys.stdout.isatty():
+        return False
+    return os.environ.get("CHUN_NO_ANIM") != "1" and "--no-anim" not in sys.argv[1:]
 
 
-def simulate_downloading(duration=3, rgb_config=None):
+def simulate_downloading(duration=3, theme=None):
     """Simulates downloading with a progress bar."""
-    cyan_fg = rgb_config.get("colors", "cyan_fg", fallback="0,255,255")
-    color_code = get_rgb_color_code(cyan_fg)
+    if not animations_enabled():
+        return
+    init_colors()
+    color_code = theme.cyan_fg
     
     animation_chars = ['[=     ]', '[ =    ]', '[  =   ]', '[   =  ]', '[    = ]', '[     =]']
-    for i in range(101):
-        time.sleep(duration / 100)
-        progress_bar = animation_chars[i%len(animation_chars)]
-        print(f"\r{color_code}Downloading... {progress_bar} {i}%{Fore.RESET}", end="")
+    # One frame per shown percentage; the spinner advances once per frame
+    percents = range(0, 101, DOWNLOAD_PERCENT_STEP)
+    frames = [
+        f"\r{color_code}Downloading... {animation_chars[n % len(animation_chars)]} {i}%{RESET}"
+        for n, i in enumerate(percents)
+    ]
+    frame_time = duration / 100
+    start_time = time.perf_counter()
+    for i, frame in zip(percents, frames):
+        delay = start_time + (i + 1) * frame_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sys.stdout.write(frame)
+        sys.stdout.flush()
     print()  # Add a newline after the progress bar finishes
-    blue_print("Download complete.", rgb_config)
+    blue_print("Download complete.", theme)
 
 
-def simulate_loading(duration=3, rgb_config=None):
+def simulate_loading(duration=3, theme=None):
     """Simulates loading with a simple animation."""
-    magenta_fg = rgb_config.get("colors", "magenta_fg", fallback="255,0,255")
-    color_code = get_rgb_color_code(magenta_fg)
+    if not animations_enabled():
+        return
+    init_colors()
+    color_code = theme.magenta_fg
     
     loading_patterns = [
         "  [-----]   ",
@@ -206,11 +376,12 @@ def simulate_loading(duration=3, rgb_config=None):
         "   [----=-]   ",
         "   [-----=]   ",
     ]
-    start_time = time.time()
+    frames = [f"\r{color_code}Loading... {pattern}  {RESET}" for pattern in loading_patterns]
+    deadline = time.perf_counter() + duration
     current_pattern_index = 0
-    while (time.time() - start_time) < duration:
-        print(f"\r{color_code}Loading... {loading_patterns[current_pattern_index % len(loading_patterns)]}  {Fore.RESET}", end="",
-              flush=True)
+    while time.perf_counter() < deadline:
+        sys.stdout.write(frames[current_pattern_index % len(frames)])
+        sys.stdout.flush()
         time.sleep(0.1)
         current_pattern_index += 1
     print("\rLoading complete.          ")
@@ -218,154 +389,218 @@ def simulate_loading(duration=3, rgb_config=None):
 
 def read_prep_command():
     """Reads the preparation command from the file."""
-    if not os.path.exists(HCK_COMMAND_FILE):
+    # pathlib is only needed here, and only when hack is enabled
+    from pathlib import Path
+    try:
+        return Path(HCK_COMMAND_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
         blue_print("Error: hck command file not found.")
         return None
-    try:
-        with open(HCK_COMMAND_FILE, "r", encoding="utf-8") as f:
-            command = f.read().strip()
-        return command
     except Exception as e:
         blue_print(f"Error reading hck command file: {e}")
         return None
 
 
-def start_gemini_interaction(config, rgb_config, prep_command=None):
+def start_gemini_interaction(config, theme, prep_command=None):
     """Starts AI interaction, now with dialog history"""
     api_key = get_api_key(config)
     if not api_key:
         return
 
+    genai = get_genai()
     genai.configure(api_key=api_key)
-    model_name = config.get("gemini", "model", fallback="gemini-pro")
-    temperature = config.getfloat("gemini", "temperature", fallback=0.9)
-    top_k = config.getint("gemini", "top_k", fallback=40)
-    top_p = config.getfloat("gemini", "top_p", fallback=0.9)
-
-    model = genai.GenerativeModel(model_name)
-    blue_print("Successfully connected to the model!", rgb_config)
-    green_fg = rgb_config.get("colors", "green_fg", fallback="0,255,0")
-    yellow_fg = rgb_config.get("colors", "yellow_fg", fallback="255,255,0")
-
-    user_color_code = get_rgb_color_code(green_fg)
-    gemini_color_code = get_rgb_color_code(yellow_fg)
+    settings = GeminiSettings(config)
+
+    model = genai.GenerativeModel(settings.model_name)
+    # The generation config is the same for every turn, so build it once
+    generation_config = genai.types.GenerationConfig(
+        temperature=settings.temperature, top_k=settings.top_k, top_p=settings.top_p
+    )
+    blue_print("Successfully connected to the model!", theme)
+    # Both prefixes are the same every turn, so format them once
+    user_prompt = f"{theme.green_fg}user&//: {theme.reset}"
+    gemini_prefix = f"\n{theme.yellow_fg}//chun.com&: {theme.reset}"
     
     # Initialize dialog history
     dialog_history = []
     
     if prep_command:
          dialog_history.append({"role": "user", "parts": [prep_command]})
+    # The prep command stays pinned at the start when old turns are dropped
+    pinned = len(dialog_history)
+    max_messages = 2 * settings.max_history_turns
     
     while True:
-        user_input = input(f"{user_color_code}user&//: \033[0m")
+        user_input = input(user_prompt)
         if user_input.lower() == "exit":
-            blue_print("Program exited.", rgb_config)
+            blue_print("Program exited.", theme)
             break
             
         dialog_history.append({"role": "user", "parts": [user_input]})
 
+        reply_line_open = False
         try:
+            # Stream the reply so text shows up as soon as the first chunk arrives
             response = model.generate_content(
                 dialog_history,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature, top_k=top_k, top_p=top_p
-                ),
+                generation_config=generation_config,
+                stream=True,
             )
+            sys.stdout.write(gemini_prefix)
+            reply_line_open = True
+            for chunk in response:
+                sys.stdout.write(chunk.text)
+                sys.stdout.flush()
+            print()
+            reply_line_open = False
+            response.resolve()
             dialog_history.append({"role": "model", "parts": [response.text]})
-            print(f"\n{gemini_color_code}//chun.com&: \033[0m{response.text}")
+            if max_messages > 0 and len(dialog_history) - pinned > max_messages:
+                del dialog_history[pinned:len(dialog_history) - max_messages]
+                # Keep the trimmed history starting with a user message
+                while dialog_history[pinned]["role"] == "model":
+                    del dialog_history[pinned]
         except Exception as e:
-            blue_print(f"Error: {e}", rgb_config)
+            if reply_line_open:
+                print()  # Keep the error off the partially streamed reply
+            # Drop the unanswered message so the next turn does not resend it
+            if dialog_history[-1]["role"] == "user":
+                dialog_history.pop()
+            blue_print(f"Error: {e}", theme)
             
 
-def setting_mode(config, rgb_config):
+SETTING_MENU_LINES = (
+    "\n=== Setting Mode ===",
+    "1. View Current Settings",
+    "2. Modify Setting",
+    "3. Save and Exit",
+    "4. Exit Without Saving",
+)
+
+
+def format_setting_menu(theme):
+    """Formats the setting mode menu once, in the same colors as blue_print."""
+    return "".join(format_blue(line, theme) + "\n" for line in SETTING_MENU_LINES)
+
+
+def _show_settings(config, rgb_config, theme):
+    """Setting mode option 1: prints the current settings."""
+    blue_print("\nCurrent Settings:", theme)
+    lines = [f"  {key}: {value}" for key, value in config["gemini"].items()]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    blue_print("\nRGB Settings:", theme)
+    lines = [f"  {key}: {value}" for key, value in rgb_config["colors"].items()]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _modify_setting(config, rgb_config, theme):
+    """Setting mode option 2: changes one gemini or rgb setting."""
+    setting_type = input(
+        "Enter 'gemini' to modify gemini settings or 'rgb' to modify rgb settings: "
+    ).strip().lower()
+    if setting_type == "gemini":
+        key = input(
+            "Enter setting to modify (e.g., model, api_key, temperature, top_k, top_p, hack, max_history_turns): "
+        ).strip()
+        if key in config["gemini"]:
+            new_value = input(f"Enter new value for {key}: ").strip()
+            config["gemini"][key] = new_value
+            blue_print("Setting modified.", theme)
+        else:
+            blue_print("Invalid setting.", theme)
+
+    elif setting_type == "rgb":
+        key = input(
+            "Enter rgb setting to modify (e.g., blue_fg, green_fg, yellow_fg, cyan_fg, magenta_fg, blue_bg): "
+        ).strip()
+        if key in rgb_config["colors"]:
+            new_value = input(f"Enter new value for {key} (e.g., 255,255,255): ").strip()
+            rgb_config["colors"][key] = new_value
+            theme.update(rgb_config)
+            blue_print("RGB setting modified.", theme)
+        else:
+            blue_print("Invalid setting.", theme)
+    else:
+        blue_print("Invalid setting type.", theme)
+
+
+def _save_and_exit(config, rgb_config, theme):
+    """Setting mode option 3: saves both config files and leaves."""
+    save_config(config)
+    _write_ini(RGB_FILE, rgb_config)
+    blue_print("Settings saved, exiting setting mode.", theme)
+    return True
+
+
+def _exit_without_saving(config, rgb_config, theme):
+    """Setting mode option 4: leaves without saving."""
+    blue_print("Exiting setting mode, changes not saved.", theme)
+    return True
+
+
+# Setting mode handlers by menu choice; a handler returns True to leave the menu
+SETTING_HANDLERS = {
+    "1": _show_settings,
+    "2": _modify_setting,
+    "3": _save_and_exit,
+    "4": _exit_without_saving,
+}
+
+
+def setting_mode(config, rgb_config, theme):
     """Configuration mode, allows users to view and modify settings."""
+    menu_colors = None
     while True:
-        blue_print("\n=== Setting Mode ===", rgb_config)
-        blue_print("1. View Current Settings", rgb_config)
-        blue_print("2. Modify Setting", rgb_config)
-        blue_print("3. Save and Exit", rgb_config)
-        blue_print("4. Exit Without Saving", rgb_config)
+        # Rebuild the menu only when an RGB change altered its colors
+        if menu_colors != (theme.blue_bg, theme.blue_fg):
+            menu_colors = (theme.blue_bg, theme.blue_fg)
+            menu = format_setting_menu(theme)
+        sys.stdout.write(menu)
         choice = input("Select operation: ")
-
-        if choice == "1":
-            blue_print("\nCurrent Settings:", rgb_config)
-            for key, value in config.items("gemini"):
-                print(f"  {key}: {value}")
-
-            blue_print("\nRGB Settings:", rgb_config)
-            for key, value in rgb_config.items("colors"):
-                print(f"  {key}: {value}")
-
-        elif choice == "2":
-            setting_type = input(
-                "Enter 'gemini' to modify gemini settings or 'rgb' to modify rgb settings: "
-            ).strip().lower()
-            if setting_type == "gemini":
-                key = input(
-                    "Enter setting to modify (e.g., model, api_key, temperature, top_k, top_p, hack): "
-                ).strip()
-                if key in config["gemini"]:
-                    new_value = input(f"Enter new value for {key}: ").strip()
-                    config["gemini"][key] = new_value
-                    blue_print("Setting modified.", rgb_config)
-                else:
-                    blue_print("Invalid setting.", rgb_config)
-
-            elif setting_type == "rgb":
-                key = input(
-                    "Enter rgb setting to modify (e.g., blue_fg, green_fg, yellow_fg, cyan_fg, magenta_fg, blue_bg): "
-                ).strip()
-                if key in rgb_config["colors"]:
-                    new_value = input(f"Enter new value for {key} (e.g., 255,255,255): ").strip()
-                    rgb_config["colors"][key] = new_value
-                    blue_print("RGB setting modified.", rgb_config)
-                else:
-                    blue_print("Invalid setting.", rgb_config)
-            else:
-                blue_print("Invalid setting type.", rgb_config)
-
-        elif choice == "3":
-            save_config(config)
-            with open(RGB_FILE, "w") as f:
-                rgb_config.write(f)
-            blue_print("Settings saved, exiting setting mode.", rgb_config)
-            break
-        elif choice == "4":
-            blue_print("Exiting setting mode, changes not saved.", rgb_config)
+        handler = SETTING_HANDLERS.get(choice)
+        if handler is None:
+            blue_print("Invalid choice, please try again.", theme)
+        elif handler(config, rgb_config, theme):
             break
-        else:
-            blue_print("Invalid choice, please try again.", rgb_config)
 
 
 def main():
-    check_and_install_libraries()
+    # Fast path: skip the library check (and its output) once it has passed
+    if not os.path.exists(INSTALLED_MARKER):
+        check_and_install_libraries()
     config = load_config()
     rgb_config = load_rgb_config()
+    theme = ColorTheme(rgb_config)
 
     api_key = get_api_key(config)
-    list_and_save_models(api_key, rgb_config)
+    # Listing models is a network round-trip, so only refresh a stale list
+    if not models_file_is_fresh():
+        list_and_save_models(api_key, theme)
 
-    hack_enabled = config.getboolean("gemini", "hack", fallback=True)
+    hack_enabled = parse_bool(config.get("gemini", {}).get("hack", "true"))
 
     prep_command = None
     if hack_enabled:
-        simulate_downloading(random.uniform(1.5, 3.5), rgb_config)
-        simulate_loading(random.uniform(1, 3), rgb_config)
+        simulate_downloading(random.uniform(1.5, 3.5), theme)
+        simulate_loading(random.uniform(1, 3), theme)
         prep_command = read_prep_command()
     if api_key:
-         start_gemini_interaction(config, rgb_config, prep_command)
+         start_gemini_interaction(config, theme, prep_command)
 
     while True:
         command = input(
-            "Enter command ('setting' for settings, 'exit' to quit): "
+            "Enter command ('setting' for settings, 'models' to refresh the model list, 'exit' to quit): "
         ).strip().lower()
         if command == "setting":
-            setting_mode(config, rgb_config)
+            setting_mode(config, rgb_config, theme)
+        elif command == "models":
+            list_and_save_models(get_api_key(config), theme)
         elif command == "exit":
-            blue_print("Program exited.", rgb_config)
+            blue_print("Program exited.", theme)
             break
         else:
-            blue_print("Invalid command, please try again.", rgb_config)
+            blue_print("Invalid command, please try again.", theme)
 
 
 if __name__ == "__main__":